@@ -5,10 +5,16 @@ This application provides REST API endpoints for making predictions using
 trained machine learning models for fetal health classification.
 """
 
+import asyncio
+import os
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import asynccontextmanager
+from functools import partial
 
-from fastapi import FastAPI, HTTPException, status
+from fastapi import Depends, FastAPI, HTTPException, Request, Response, status
+from fastapi.exceptions import RequestValidationError
 from fastapi.middleware.cors import CORSMiddleware
+from pydantic import BaseModel, TypeAdapter, ValidationError
 
 from models import ModelManager
 from schemas import (
@@ -24,15 +30,158 @@ from schemas import (
 # Global model manager instance
 model_manager = None
 
+# Thread pool for CPU-bound inference, sized to the number of cores
+inference_executor = None
+
+# Serializers for the dataclass prediction responses
+PREDICTION_RESPONSE_ADAPTER = TypeAdapter(PredictionResponse)
+BATCH_RESPONSE_ADAPTER = TypeAdapter(BatchPredictionResponse)
+
+
+def _request_body_schema(model: type[BaseModel]) -> dict:
+    """
+    Build the OpenAPI request body for a model parsed from the raw body.
+    
+    Endpoints that validate the raw request bytes themselves do not declare
+    a body parameter, so the schema is documented explicitly instead.
+    
+    Args:
+        model: Pydantic model describing the request body
+        
+    Returns:
+        dict: OpenAPI operation fragment with the request body schema
+    """
+    schema = model.model_json_schema()
+    definitions = schema.pop("$defs", {})
+    
+    def inline(node):
+        if isinstance(node, dict):
+            if "$ref" in node:
+                return inline(definitions[node["$ref"].split("/")[-1]])
+            return {key: inline(value) for key, value in node.items()}
+        if isinstance(node, list):
+            return [inline(value) for value in node]
+        return node
+    
+    return {
+        "requestBody": {
+            "required": True,
+            "content": {"application/json": {"schema": inline(schema)}},
+        }
+    }
+
+
+def _json_response(adapter: TypeAdapter, content) -> Response:
+    """
+    Serialize a response model straight to JSON bytes.
+    
+    pydantic-core writes the JSON in a single pass, instead of FastAPI
+    converting the model to Python primitives and encoding them again.
+    The endpoint's response_model is still used for the OpenAPI docs.
+    
+    Args:
+        adapter: Type adapter for the response model
+        content: Response model instance to serialize
+        
+    Returns:
+        Response: JSON response with the serialized model
+    """
+    return Response(
+        content=adapter.dump_json(content),
+        media_type="application/json"
+    )
+
+
+async def _run_inference(func, **kwargs):
+    """
+    Run a blocking inference call on the inference thread pool.
+    
+    Keeps the event loop free while models run. Requests only overlap
+    where the GIL is released, i.e. inside ONNX Runtime sessions and
+    scikit-learn's compiled tree traversal; request parsing, scaling and
+    response building still run one thread at a time. Falls back to the
+    loop's default executor when the inference pool has not been started.
+    
+    Args:
+        func: Blocking ModelManager method to call
+        **kwargs: Keyword arguments for the call
+        
+    Returns:
+        The result of the call
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        inference_executor,
+        partial(func, **kwargs)
+    )
+
+
+def _validation_error(error: ValidationError) -> RequestValidationError:
+    """
+    Convert a pydantic validation error into FastAPI's 422 error.
+    
+    Args:
+        error: Validation error raised while parsing the request body
+        
+    Returns:
+        RequestValidationError: Error with locations relative to the body
+    """
+    return RequestValidationError([
+        {**detail, "loc": ("body", *detail["loc"])}
+        for detail in error.errors(include_url=False)
+    ])
+
+
+async def parse_prediction_request(request: Request) -> PredictionRequest:
+    """
+    Validate a single prediction request straight from the JSON body.
+    
+    Parsing and validation happen in a single pydantic-core pass over the
+    raw bytes, skipping the intermediate Python dict.
+    
+    Args:
+        request: Incoming HTTP request
+        
+    Returns:
+        PredictionRequest: Validated prediction request
+        
+    Raises:
+        RequestValidationError: If the body is not a valid prediction request
+    """
+    try:
+        return PredictionRequest.model_validate_json(await request.body())
+    except ValidationError as e:
+        raise _validation_error(e)
+
+
+async def parse_batch_prediction_request(request: Request) -> BatchPredictionRequest:
+    """
+    Validate a batch prediction request straight from the JSON body.
+    
+    Args:
+        request: Incoming HTTP request
+        
+    Returns:
+        BatchPredictionRequest: Validated batch prediction request
+        
+    Raises:
+        RequestValidationError: If the body is not a valid batch request
+    """
+    try:
+        return BatchPredictionRequest.model_validate_json(await request.body())
+    except ValidationError as e:
+        raise _validation_error(e)
+
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """
     Application lifespan manager.
     
-    Loads models on startup and cleans up on shutdown.
+    Loads models and starts the inference thread pool on startup, and
+    cleans up on shutdown.
     """
-    global model_manager
+    global model_manager, inference_executor
     
     # Startup: Load models
     print("Loading machine learning models...")
@@ -40,10 +189,17 @@ async def lifespan(app: FastAPI):
     model_manager.load_models()
     print("Models loaded successfully!")
     
+    inference_executor = ThreadPoolExecutor(
+        max_workers=os.cpu_count(),
+        thread_name_prefix="inference"
+    )
+    
     yield
     
     # Shutdown: Cleanup
     print("Shutting down application...")
+    inference_executor.shutdown(wait=True)
+    inference_executor = None
 
 
 # Initialize FastAPI application
@@ -159,9 +315,10 @@ async def list_models():
     
     Provide the fetal health features and optionally specify which model to use.
     If no model is specified, the default model (Gradient Boosting) will be used.
-    """
+    """,
+    openapi_extra=_request_body_schema(PredictionRequest),
 )
-async def predict(request: PredictionRequest):
+async def predict(request: PredictionRequest = Depends(parse_prediction_request)):
     """
     Make a single prediction.
     
@@ -181,11 +338,12 @@ async def predict(request: PredictionRequest):
         )
     
     try:
-        result = model_manager.predict(
+        result = await _run_inference(
+            model_manager.predict,
             features=request.features,
             model_name=request.model_name
         )
-        return result
+        return _json_response(PREDICTION_RESPONSE_ADAPTER, result)
     except ValueError as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -208,9 +366,12 @@ async def predict(request: PredictionRequest):
     
     Provide a list of feature sets and optionally specify which model to use.
     This endpoint is more efficient for processing multiple records.
-    """
+    """,
+    openapi_extra=_request_body_schema(BatchPredictionRequest),
 )
-async def predict_batch(request: BatchPredictionRequest):
+async def predict_batch(
+    request: BatchPredictionRequest = Depends(parse_batch_prediction_request)
+):
     """
     Make batch predictions.
     
@@ -230,11 +391,15 @@ async def predict_batch(request: BatchPredictionRequest):
         )
     
     try:
-        results = model_manager.predict_batch(
+        results = await _run_inference(
+            model_manager.predict_batch,
             features_list=request.features_list,
             model_name=request.model_name
         )
-        return BatchPredictionResponse(predictions=results)
+        return _json_response(
+            BATCH_RESPONSE_ADAPTER,
+            BatchPredictionResponse(predictions=results)
+        )
     except ValueError as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
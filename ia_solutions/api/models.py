@@ -5,14 +5,19 @@ Handles model loading, preprocessing, and predictions.
 """
 
 import os
-import pickle
 from typing import Optional
 
+import joblib
 import numpy as np
 import pandas as pd
 from sklearn.preprocessing import StandardScaler
 
-from schemas import FetalHealthFeatures, PredictionResponse
+try:
+    import onnxruntime as ort
+except ImportError:  # ONNX Runtime is optional; models fall back to scikit-learn
+    ort = None
+
+from schemas import FetalHealthFeatures, PredictionResponse, features_to_ndarray
 
 
 class ModelManager:
@@ -20,6 +25,8 @@ class ModelManager:
     Manager class for handling machine learning models.
     
     Loads models on initialization and provides methods for making predictions.
+    When an ONNX export of a model is found next to its saved model and
+    onnxruntime is installed, predictions run through ONNX Runtime.
     """
     
     # Model configuration - use absolute path
@@ -29,6 +36,7 @@ class ModelManager:
         "decision_tree": "decision_tree_model.pkl",
         "gradient_boosting": "gradient_boosting_model.pkl",
     }
+    SCALER_FILE = "scaler.pkl"
     
     # Health status mapping
     HEALTH_MAPPING = {
@@ -36,19 +44,22 @@ class ModelManager:
         2.0: "Suspect",
         3.0: "Pathological"
     }
+    # HEALTH_MAPPING as lookup arrays for batch interpretation
+    HEALTH_CODES = np.fromiter(HEALTH_MAPPING.keys(), dtype=np.float64)
+    HEALTH_LABELS = np.array(list(HEALTH_MAPPING.values()), dtype=object)
     
     def __init__(self):
         """Initialize the model manager."""
         self.models = {}
-        self.scaler = StandardScaler()
-        self._scaler_fitted = False
+        self.scaler: Optional[StandardScaler] = None
     
     def load_models(self) -> None:
         """
         Load all available models from disk.
         
         Raises:
-            FileNotFoundError: If model files are not found
+            FileNotFoundError: If models are found without the training
+                scaler
             Exception: If model loading fails
         """
         for model_name, filename in self.MODEL_FILES.items():
@@ -59,17 +70,69 @@ class ModelManager:
                 continue
             
             try:
-                with open(model_path, 'rb') as file:
-                    model = pickle.load(file)
+                model = joblib.load(model_path)
                 self.models[model_name] = {
                     "model": model,
                     "path": model_path,
-                    "type": type(model).__name__
+                    "type": type(model).__name__,
+                    "session": self._load_onnx_session(model_path)
                 }
                 print(f"Loaded model: {model_name} ({type(model).__name__})")
             except Exception as e:
                 print(f"Error loading model {model_name}: {str(e)}")
                 raise
+        
+        self._load_scaler()
+    
+    def _load_onnx_session(self, model_path: str):
+        """
+        Create an ONNX Runtime session for a model's ONNX export, if available.
+        
+        Args:
+            model_path: Path to the saved model
+            
+        Returns:
+            onnxruntime.InferenceSession or None if no ONNX model can be used
+        """
+        onnx_path = os.path.splitext(model_path)[0] + ".onnx"
+        if ort is None or not os.path.exists(onnx_path):
+            return None
+        
+        # Requests already run in parallel on the API's inference thread
+        # pool, so each session runs single-threaded instead of spawning an
+        # intra-op pool over every core
+        session_options = ort.SessionOptions()
+        session_options.intra_op_num_threads = 1
+        
+        session = ort.InferenceSession(
+            onnx_path,
+            sess_options=session_options,
+            providers=["CPUExecutionProvider"]
+        )
+        print(f"Loaded ONNX model: {onnx_path}")
+        return session
+    
+    def _load_scaler(self) -> None:
+        """
+        Load the scaler fitted during training.
+        
+        Raises:
+            FileNotFoundError: If models were loaded but the scaler file
+                is missing; the models cannot be served without it
+        """
+        scaler_path = os.path.join(self.MODELS_DIR, self.SCALER_FILE)
+        
+        if not os.path.exists(scaler_path):
+            if self.models:
+                raise FileNotFoundError(
+                    f"Scaler file not found: {scaler_path}. "
+                    "Retrain the models to create it."
+                )
+            print(f"Warning: Scaler file not found: {scaler_path}")
+            return
+        
+        self.scaler = joblib.load(scaler_path)
+        print(f"Loaded scaler: {scaler_path}")
     
     def get_loaded_models(self) -> list[str]:
         """
@@ -93,35 +156,78 @@ class ModelManager:
                 "name": name,
                 "type": info["type"],
                 "loaded": True,
-                "file_path": info["path"]
+                "file_path": info["path"],
+                "runtime": (
+                    "scikit-learn" if info.get("session") is None
+                    else "onnxruntime"
+                )
             })
         return models_info
     
-    def _preprocess_features(self, features: list[float]) -> np.ndarray:
+    def _preprocess_features(self, features: list[float] | np.ndarray) -> np.ndarray:
         """
         Preprocess features for prediction.
         
         Args:
-            features: List of feature values
+            features: List of feature values for one sample, or a
+                (n_samples, n_features) feature matrix
             
         Returns:
             np.ndarray: Preprocessed features
         """
-        # Convert to numpy array and reshape
-        features_array = np.array(features).reshape(1, -1)
+        # Convert to a 2D float64 array without copying matrices
+        features_array = np.asarray(features, dtype=np.float64)
+        if features_array.ndim == 1:
+            features_array = features_array.reshape(1, -1)
         
-        # For prediction, we fit the scaler on the input data
-        # In production, you should save and load the scaler used during training
-        if not self._scaler_fitted:
-            # This is a simplified approach - ideally load the training scaler
-            self.scaler.fit(features_array)
-            self._scaler_fitted = True
+        if self.scaler is None:
+            raise RuntimeError("Scaler not loaded; call load_models() first")
         
         # Scale features
         scaled_features = self.scaler.transform(features_array)
         
         return scaled_features
     
+    def _run_model(
+        self,
+        model_name: str,
+        features: np.ndarray
+    ) -> tuple[np.ndarray, Optional[np.ndarray]]:
+        """
+        Run a model on preprocessed features.
+        
+        Args:
+            model_name: Name of a loaded model
+            features: Preprocessed (n_samples, n_features) feature matrix
+            
+        Returns:
+            tuple: Predicted codes and class probabilities (None if the
+                model does not support predict_proba)
+        """
+        model_info = self.models[model_name]
+        
+        session = model_info.get("session")
+        if session is not None:
+            input_name = session.get_inputs()[0].name
+            labels, probabilities = session.run(
+                None,
+                {input_name: features.astype(np.float32)}
+            )
+            return labels.astype(np.float64), probabilities
+        
+        model = model_info["model"]
+        predictions = model.predict(features)
+        
+        # Get probabilities if available (for models that support predict_proba)
+        probabilities = None
+        if hasattr(model, 'predict_proba'):
+            try:
+                probabilities = model.predict_proba(features)
+            except Exception:
+                pass
+        
+        return predictions, probabilities
+    
     def _interpret_prediction(self, prediction: float) -> str:
         """
         Interpret numerical prediction into health status.
@@ -134,6 +240,29 @@ class ModelManager:
         """
         return self.HEALTH_MAPPING.get(prediction, "Unknown")
     
+    def _interpret_predictions(self, predictions: np.ndarray) -> list[str]:
+        """
+        Interpret a batch of numerical predictions into health status labels.
+        
+        Args:
+            predictions: Array of numerical prediction values
+            
+        Returns:
+            list[str]: Health status label for each prediction
+        """
+        predictions = np.asarray(predictions)
+        
+        # Gather labels by code without branching, then blank out unknown codes
+        label_indices = np.clip(
+            predictions.astype(np.int64) - 1,
+            0,
+            len(self.HEALTH_LABELS) - 1
+        )
+        labels = np.take(self.HEALTH_LABELS, label_indices)
+        known = np.isin(predictions, self.HEALTH_CODES)
+        
+        return np.where(known, labels, "Unknown").tolist()
+    
     def predict(
         self,
         features: FetalHealthFeatures,
@@ -158,29 +287,23 @@ class ModelManager:
                 f"Available models: {list(self.models.keys())}"
             )
         
-        # Convert features to list
-        features_list = features.to_list()
-        
         # Preprocess features
-        preprocessed_features = self._preprocess_features(features_list)
-        
-        # Get model
-        model = self.models[model_name]["model"]
+        preprocessed_features = self._preprocess_features(features.to_ndarray())
         
         # Make prediction
-        prediction = model.predict(preprocessed_features)[0]
+        predictions, probabilities = self._run_model(
+            model_name,
+            preprocessed_features
+        )
+        prediction = predictions[0]
         
         # Interpret prediction
         health_status = self._interpret_prediction(prediction)
         
-        # Get confidence if available (for models that support predict_proba)
+        # Get confidence if available
         confidence = None
-        if hasattr(model, 'predict_proba'):
-            try:
-                probabilities = model.predict_proba(preprocessed_features)[0]
-                confidence = float(max(probabilities))
-            except Exception:
-                pass
+        if probabilities is not None:
+            confidence = float(max(probabilities[0]))
         
         return PredictionResponse(
             prediction_code=float(prediction),
@@ -207,9 +330,42 @@ class ModelManager:
         Raises:
             ValueError: If model not found or invalid features
         """
-        results = []
-        for features in features_list:
-            result = self.predict(features, model_name)
-            results.append(result)
+        if model_name not in self.models:
+            raise ValueError(
+                f"Model '{model_name}' not found. "
+                f"Available models: {list(self.models.keys())}"
+            )
+        
+        if not features_list:
+            return []
         
-        return results
+        # Fill a single contiguous feature matrix for the whole batch
+        features_matrix = features_to_ndarray(features_list)
+        
+        preprocessed_features = self._preprocess_features(features_matrix)
+        
+        # Predict the whole batch with one model call
+        predictions, probabilities = self._run_model(
+            model_name,
+            preprocessed_features
+        )
+        
+        confidences = [None] * len(features_list)
+        if probabilities is not None:
+            confidences = np.max(probabilities, axis=1).tolist()
+        
+        health_statuses = self._interpret_predictions(predictions)
+        
+        return [
+            PredictionResponse(
+                prediction_code=prediction,
+                health_status=health_status,
+                model_used=model_name,
+                confidence=confidence
+            )
+            for prediction, health_status, confidence in zip(
+                np.asarray(predictions, dtype=np.float64).tolist(),
+                health_statuses,
+                confidences
+            )
+        ]
@@ -4,9 +4,28 @@ Pydantic schemas for request and response models.
 Defines the data structures for API requests and responses.
 """
 
-from typing import Optional
+from dataclasses import dataclass
+from typing import Annotated, Literal, Optional
 
-from pydantic import BaseModel, Field, field_validator
+import numpy as np
+from pydantic import (
+    BaseModel,
+    BeforeValidator,
+    Field,
+)
+
+
+def _default_model_name(value):
+    """Map an explicit null model name to the default model."""
+    return "gradient_boosting" if value is None else value
+
+
+# Supported model names, checked by the compiled core schema; null selects
+# the default model
+ModelName = Annotated[
+    Literal["decision_tree", "gradient_boosting"],
+    BeforeValidator(_default_model_name)
+]
 
 
 class FetalHealthFeatures(BaseModel):
@@ -46,6 +65,53 @@ class FetalHealthFeatures(BaseModel):
             self.uterine_contractions,
         ]
 
+    def to_ndarray(
+        self,
+        out: Optional[np.ndarray] = None,
+        row: int = 0
+    ) -> np.ndarray:
+        """
+        Write features into a row of a float64 feature matrix.
+        
+        Args:
+            out: Preallocated matrix with FEATURE_COUNT columns; a new
+                (1, FEATURE_COUNT) matrix is allocated when omitted
+            row: Row of ``out`` to write the features into
+            
+        Returns:
+            np.ndarray: The matrix holding the features
+        """
+        if out is None:
+            out = np.empty((1, FEATURE_COUNT), dtype=np.float64)
+        out[row, 0] = self.severe_decelerations
+        out[row, 1] = self.accelerations
+        out[row, 2] = self.fetal_movement
+        out[row, 3] = self.uterine_contractions
+        return out
+
+
+# Number of model input features, in the order used by to_list/to_ndarray
+FEATURE_COUNT = len(FetalHealthFeatures.model_fields)
+
+
+def features_to_ndarray(features_list: list[FetalHealthFeatures]) -> np.ndarray:
+    """
+    Fill one contiguous float64 matrix with a list of feature sets.
+    
+    Args:
+        features_list: Fetal health features, one per row
+        
+    Returns:
+        np.ndarray: (len(features_list), FEATURE_COUNT) feature matrix
+    """
+    features_matrix = np.empty(
+        (len(features_list), FEATURE_COUNT),
+        dtype=np.float64
+    )
+    for row, features in enumerate(features_list):
+        features.to_ndarray(features_matrix, row)
+    return features_matrix
+
 
 class PredictionRequest(BaseModel):
     """Request model for single prediction."""
@@ -53,46 +119,37 @@ class PredictionRequest(BaseModel):
         ...,
         description="Fetal health features for prediction"
     )
-    model_name: Optional[str] = Field(
+    model_name: ModelName = Field(
         default="gradient_boosting",
         description="Name of the model to use for prediction",
         example="gradient_boosting"
     )
 
-    @field_validator('model_name')
-    @classmethod
-    def validate_model_name(cls, v):
-        """Validate model name."""
-        if v is None:
-            return "gradient_boosting"
-        valid_models = ["decision_tree", "gradient_boosting"]
-        if v not in valid_models:
-            raise ValueError(f"Model must be one of {valid_models}")
-        return v
-
 
-class PredictionResponse(BaseModel):
-    """Response model for single prediction."""
-    prediction_code: float = Field(
-        ...,
+@dataclass(slots=True)
+class PredictionResponse:
+    """
+    Response model for single prediction.
+    
+    A slotted dataclass rather than a Pydantic model: responses are built
+    by the server once per prediction and need no validation.
+    """
+    prediction_code: Annotated[float, Field(
         description="Numerical prediction code (1.0, 2.0, or 3.0)",
-        example=1.0
-    )
-    health_status: str = Field(
-        ...,
+        examples=[1.0]
+    )]
+    health_status: Annotated[str, Field(
         description="Human-readable health status",
-        example="Normal"
-    )
-    model_used: str = Field(
-        ...,
+        examples=["Normal"]
+    )]
+    model_used: Annotated[str, Field(
         description="Name of the model used for prediction",
-        example="gradient_boosting"
-    )
-    confidence: Optional[float] = Field(
-        default=None,
+        examples=["gradient_boosting"]
+    )]
+    confidence: Annotated[Optional[float], Field(
         description="Prediction confidence (if available)",
-        example=0.95
-    )
+        examples=[0.95]
+    )] = None
 
 
 class BatchPredictionRequest(BaseModel):
@@ -102,30 +159,19 @@ class BatchPredictionRequest(BaseModel):
         description="List of fetal health features for batch prediction",
         min_length=1
     )
-    model_name: Optional[str] = Field(
+    model_name: ModelName = Field(
         default="gradient_boosting",
         description="Name of the model to use for predictions",
         example="gradient_boosting"
     )
 
-    @field_validator('model_name')
-    @classmethod
-    def validate_model_name(cls, v):
-        """Validate model name."""
-        if v is None:
-            return "gradient_boosting"
-        valid_models = ["decision_tree", "gradient_boosting"]
-        if v not in valid_models:
-            raise ValueError(f"Model must be one of {valid_models}")
-        return v
-
 
-class BatchPredictionResponse(BaseModel):
+@dataclass(slots=True)
+class BatchPredictionResponse:
     """Response model for batch predictions."""
-    predictions: list[PredictionResponse] = Field(
-        ...,
+    predictions: Annotated[list[PredictionResponse], Field(
         description="List of prediction results"
-    )
+    )]
 
 
 class HealthResponse(BaseModel):
@@ -169,3 +215,8 @@ class ModelInfoResponse(BaseModel):
         description="Path to the model file",
         example="ia_solutions/models/gradient_boosting_model.pkl"
     )
+    runtime: Literal["onnxruntime", "scikit-learn"] = Field(
+        default="scikit-learn",
+        description="Runtime serving the model's predictions",
+        example="onnxruntime"
+    )
@@ -11,6 +11,9 @@ import json
 # API Configuration
 BASE_URL = "http://localhost:8000"
 
+# Shared session so all calls reuse one keep-alive connection
+SESSION = requests.Session()
+
 
 def print_section(title: str):
     """Print a formatted section title."""
@@ -23,7 +26,7 @@ def test_health_check():
     """Test the health check endpoint."""
     print_section("Testing Health Check Endpoint")
     
-    response = requests.get(f"{BASE_URL}/health")
+    response = SESSION.get(f"{BASE_URL}/health")
     print(f"Status Code: {response.status_code}")
     print(f"Response: {json.dumps(response.json(), indent=2)}")
 
@@ -32,7 +35,7 @@ def test_list_models():
     """Test the list models endpoint."""
     print_section("Testing List Models Endpoint")
     
-    response = requests.get(f"{BASE_URL}/models")
+    response = SESSION.get(f"{BASE_URL}/models")
     print(f"Status Code: {response.status_code}")
     print(f"Response: {json.dumps(response.json(), indent=2)}")
 
@@ -52,7 +55,7 @@ def test_single_prediction():
         "model_name": "gradient_boosting"
     }
     
-    response = requests.post(f"{BASE_URL}/predict", json=payload)
+    response = SESSION.post(f"{BASE_URL}/predict", json=payload)
     print(f"Status Code: {response.status_code}")
     print(f"Response: {json.dumps(response.json(), indent=2)}")
 
@@ -86,7 +89,7 @@ def test_batch_prediction():
         "model_name": "gradient_boosting"
     }
     
-    response = requests.post(f"{BASE_URL}/predict/batch", json=payload)
+    response = SESSION.post(f"{BASE_URL}/predict/batch", json=payload)
     print(f"Status Code: {response.status_code}")
     print(f"Response: {json.dumps(response.json(), indent=2)}")
 
@@ -105,7 +108,7 @@ def test_different_models():
     for model_name in ["decision_tree", "gradient_boosting"]:
         print(f"\nTesting with {model_name}:")
         payload = {"features": features, "model_name": model_name}
-        response = requests.post(f"{BASE_URL}/predict", json=payload)
+        response = SESSION.post(f"{BASE_URL}/predict", json=payload)
         print(f"  Status Code: {response.status_code}")
         if response.status_code == 200:
             print(f"  Prediction: {response.json()['health_status']}")
@@ -152,7 +155,7 @@ def test_various_cases():
     for case in test_cases:
         print(f"\n{case['name']}:")
         payload = {"features": case['features'], "model_name": "gradient_boosting"}
-        response = requests.post(f"{BASE_URL}/predict", json=payload)
+        response = SESSION.post(f"{BASE_URL}/predict", json=payload)
         if response.status_code == 200:
             result = response.json()
             print(f"  Status: {result['health_status']}")
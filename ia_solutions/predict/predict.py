@@ -5,25 +5,44 @@ This script loads a trained model and makes predictions on new data,
 demonstrating how to use the saved models for inference.
 """
 
+import logging
 import os
-import pickle
+import sys
+from functools import lru_cache
 
+import joblib
+import numba
 import pandas as pd
 import numpy as np
-from sklearn.preprocessing import StandardScaler
+from numba import njit, prange
+from sklearn.ensemble import GradientBoostingClassifier
+from sklearn.tree import DecisionTreeClassifier
 
 
+logger = logging.getLogger(__name__)
+
+# The nogil tree kernel may be launched from several threads at once; only
+# the TBB and OpenMP threading layers support that (workqueue aborts)
+numba.config.THREADING_LAYER = 'threadsafe'
+
 # Constants
 MODELS_DIR = 'ia_solutions/models'
 DECISION_TREE_MODEL_PATH = os.path.join(MODELS_DIR, 'decision_tree_model.pkl')
 GRADIENT_BOOSTING_MODEL_PATH = os.path.join(MODELS_DIR, 'gradient_boosting_model.pkl')
+SCALER_PATH = os.path.join(MODELS_DIR, 'scaler.pkl')
+# Fetal health labels indexed by prediction code - 1
+HEALTH_CODES = np.array([1.0, 2.0, 3.0])
+HEALTH_LABELS = np.array(["Normal", "Suspect", "Pathological"], dtype=object)
 DATA_URL = 'https://raw.githubusercontent.com/renansantosmendes/lectures-cdas-2023/master/fetal_health_reduced.csv'
 
 
+@lru_cache(maxsize=None)
 def load_model(model_path: str):
     """
     Load a trained model from disk.
     
+    Each path is loaded only once; later calls return the cached object.
+    
     Args:
         model_path: Path to the saved model file
         
@@ -36,10 +55,9 @@ def load_model(model_path: str):
     if not os.path.exists(model_path):
         raise FileNotFoundError(f"Model file not found: {model_path}")
     
-    with open(model_path, 'rb') as file:
-        model = pickle.load(file)
+    model = joblib.load(model_path)
     
-    print(f"[OK] Model loaded successfully from: {model_path}")
+    logger.info("[OK] Model loaded successfully from: %s", model_path)
     return model
 
 
@@ -47,52 +65,266 @@ def load_sample_data(url: str, n_samples: int = 5) -> pd.DataFrame:
     """
     Load sample data for prediction demonstration.
     
+    The CSV is parsed straight into a float64 array; only the sampled rows
+    are wrapped in a DataFrame.
+    
     Args:
-        url: URL of the CSV file containing the data
+        url: URL or local path of the CSV file containing the data
         n_samples: Number of samples to load for prediction
         
     Returns:
-        DataFrame with sample data
+        DataFrame with sample data, indexed by the original row numbers
     """
-    print(f"Loading {n_samples} sample records for prediction...")
-    data = pd.read_csv(url)
-    
-    # Get features only (exclude target column)
-    features = data.iloc[:, :-1]
+    logger.info("Loading %d sample records for prediction...", n_samples)
+    with np.lib.npyio.DataSource(None).open(url) as file:
+        columns = [name.strip('"') for name in file.readline().strip().split(',')]
+        data = np.loadtxt(file, delimiter=',', dtype=np.float64, ndmin=2)
     
-    # Select random samples
-    sample_data = features.sample(n=n_samples, random_state=42)
+    # Select random samples, keeping features only (exclude target column)
+    rng = np.random.default_rng(42)
+    sample_rows = np.sort(rng.choice(len(data), size=n_samples, replace=False))
+    sample_data = pd.DataFrame(
+        data[sample_rows, :-1],
+        columns=columns[:-1],
+        index=sample_rows
+    )
     
-    print(f"[OK] Loaded {len(sample_data)} samples")
+    logger.info("[OK] Loaded %d samples", len(sample_data))
     return sample_data
 
 
-def preprocess_features(features: pd.DataFrame) -> pd.DataFrame:
+def preprocess_features(features: pd.DataFrame, scaler) -> np.ndarray:
     """
     Preprocess features by applying standardization.
     
     Args:
         features: Raw features DataFrame
+        scaler: StandardScaler fitted on the training data
         
     Returns:
-        Preprocessed features DataFrame
-    """
-    print("Preprocessing features...")
-    scaler = StandardScaler()
-    scaled_features_array = scaler.fit_transform(features)
-    scaled_features = pd.DataFrame(
-        scaled_features_array,
-        columns=features.columns,
-        index=features.index
+        Preprocessed features array, in the same row order
+    """
+    logger.info("Preprocessing features...")
+    scaled_features = scaler.transform(
+        features.to_numpy(dtype=np.float64, copy=False)
     )
-    print("[OK] Features preprocessed")
+    logger.info("[OK] Features preprocessed")
     return scaled_features
 
 
-def make_predictions(model, features: pd.DataFrame) -> np.ndarray:
+# Explicit kernel signature: scores(feature_codes, feature_index,
+# threshold_codes, children_left, children_right, leaf_values,
+# initial_scores, scale)
+TREE_KERNEL_SIGNATURE = (
+    "float64[:, ::1]("
+    "uint16[:, ::1], int32[:, ::1], uint16[:, ::1], int32[:, ::1], "
+    "int32[:, ::1], float64[:, :, ::1], float64[::1], float64)"
+)
+MAX_THRESHOLD_CODES = np.iinfo(np.uint16).max
+
+
+@njit(
+    TREE_KERNEL_SIGNATURE,
+    parallel=True,
+    nogil=True,
+    cache=True,
+    boundscheck=False,
+    fastmath=True
+)
+def _tree_ensemble_scores(
+    feature_codes,
+    feature_index,
+    threshold_codes,
+    children_left,
+    children_right,
+    leaf_values,
+    initial_scores,
+    scale
+):
+    """
+    Walk every tree of an ensemble for each sample and sum the leaf values.
+    
+    Trees are stored as padded (n_trees, max_nodes) arrays; a node is a leaf
+    when its left child is negative. Features and thresholds are compared
+    as uint16 codes (see quantize_features). Samples are processed in
+    parallel.
+    The kernel is compiled for TREE_KERNEL_SIGNATURE at import time (or
+    loaded from the on-disk cache), so the first prediction pays no JIT cost.
+    
+    Returns:
+        (n_samples, n_outputs) array of accumulated scores
+    """
+    n_samples = feature_codes.shape[0]
+    n_trees = feature_index.shape[0]
+    n_outputs = leaf_values.shape[2]
+    scores = np.empty((n_samples, n_outputs))
+    
+    for i in prange(n_samples):
+        for k in range(n_outputs):
+            scores[i, k] = initial_scores[k]
+        for t in range(n_trees):
+            node = 0
+            while children_left[t, node] >= 0:
+                if feature_codes[i, feature_index[t, node]] <= threshold_codes[t, node]:
+                    node = children_left[t, node]
+                else:
+                    node = children_right[t, node]
+            for k in range(n_outputs):
+                scores[i, k] += scale * leaf_values[t, node, k]
+    
+    return scores
+
+
+@lru_cache(maxsize=None)
+def build_tree_ensemble(model) -> dict:
+    """
+    Extract the tree arrays of a fitted model for the compiled kernel.
+    
+    Every tree is padded to the largest node count and its leaf values are
+    laid out per output column: class distributions for a decision tree and
+    one raw-score column per class for gradient boosting.
+    
+    Split thresholds are replaced by their rank among the sorted distinct
+    thresholds of the same feature. Since a feature value is quantized to
+    the number of those thresholds below it, ``x <= threshold`` holds exactly
+    when ``code(x) <= rank(threshold)``, so the integer compare is lossless.
+    
+    Args:
+        model: Fitted DecisionTreeClassifier or GradientBoostingClassifier
+        
+    Returns:
+        Dictionary with the padded tree arrays and scoring parameters
+        
+    Raises:
+        TypeError: If the model type is not supported
+        ValueError: If a feature has too many distinct thresholds for uint16
+    """
+    if isinstance(model, DecisionTreeClassifier):
+        trees = [(model.tree_, slice(None))]
+        n_outputs = model.n_classes_
+        initial_scores = np.zeros(n_outputs, dtype=np.float64)
+        scale = 1.0
+    elif isinstance(model, GradientBoostingClassifier):
+        n_outputs = model.estimators_.shape[1]
+        trees = [
+            (model.estimators_[stage, k].tree_, slice(k, k + 1))
+            for stage in range(model.estimators_.shape[0])
+            for k in range(n_outputs)
+        ]
+        initial_scores = model._raw_predict_init(
+            np.zeros((1, model.n_features_in_), dtype=np.float32)
+        )[0].astype(np.float64, order='C')
+        scale = float(model.learning_rate)
+    else:
+        raise TypeError(f"Unsupported model type: {type(model).__name__}")
+    
+    # Sorted distinct split thresholds of each feature
+    feature_bins = tuple(
+        np.unique(np.concatenate([
+            tree.threshold[(tree.children_left >= 0) & (tree.feature == feature)]
+            for tree, _ in trees
+        ]))
+        for feature in range(model.n_features_in_)
+    )
+    if max(len(bins) for bins in feature_bins) >= MAX_THRESHOLD_CODES:
+        raise ValueError("Too many distinct thresholds to quantize to uint16")
+    
+    max_nodes = max(tree.node_count for tree, _ in trees)
+    feature_index = np.zeros((len(trees), max_nodes), dtype=np.int32)
+    threshold_codes = np.zeros((len(trees), max_nodes), dtype=np.uint16)
+    children_left = np.full((len(trees), max_nodes), -1, dtype=np.int32)
+    children_right = np.full((len(trees), max_nodes), -1, dtype=np.int32)
+    leaf_values = np.zeros((len(trees), max_nodes, n_outputs), dtype=np.float64)
+    
+    for t, (tree, outputs) in enumerate(trees):
+        n_nodes = tree.node_count
+        feature_index[t, :n_nodes] = np.maximum(tree.feature, 0)
+        for node in np.flatnonzero(tree.children_left >= 0):
+            threshold_codes[t, node] = np.searchsorted(
+                feature_bins[tree.feature[node]],
+                tree.threshold[node]
+            )
+        children_left[t, :n_nodes] = tree.children_left
+        children_right[t, :n_nodes] = tree.children_right
+        leaf_values[t, :n_nodes, outputs] = tree.value[:, 0, :]
+    
+    return {
+        "feature_bins": feature_bins,
+        "feature_index": feature_index,
+        "threshold_codes": threshold_codes,
+        "children_left": children_left,
+        "children_right": children_right,
+        "leaf_values": leaf_values,
+        "initial_scores": initial_scores,
+        "scale": scale,
+        "classes": model.classes_,
+    }
+
+
+def quantize_features(ensemble: dict, features: np.ndarray) -> np.ndarray:
+    """
+    Quantize features to the threshold codes used by the tree kernel.
+    
+    Each value becomes the number of its feature's split thresholds that are
+    strictly below it. Values are rounded to float32 first, like
+    scikit-learn does for trees, so decisions match its predict exactly.
+    
+    Args:
+        ensemble: Tree arrays built by build_tree_ensemble
+        features: (n_samples, n_features) feature matrix
+        
+    Returns:
+        (n_samples, n_features) uint16 matrix of feature codes
+    """
+    features = np.asarray(features, dtype=np.float32)
+    feature_codes = np.empty(features.shape, dtype=np.uint16)
+    for feature, bins in enumerate(ensemble["feature_bins"]):
+        feature_codes[:, feature] = np.searchsorted(
+            bins,
+            features[:, feature].astype(np.float64),
+            side='left'
+        )
+    return feature_codes
+
+
+def predict_tree_ensemble(ensemble: dict, features: np.ndarray) -> np.ndarray:
+    """
+    Predict class labels with the compiled tree-ensemble kernel.
+    
+    Args:
+        ensemble: Tree arrays built by build_tree_ensemble
+        features: (n_samples, n_features) feature matrix
+        
+    Returns:
+        Array of predicted class labels
+    """
+    scores = _tree_ensemble_scores(
+        quantize_features(ensemble, features),
+        ensemble["feature_index"],
+        ensemble["threshold_codes"],
+        ensemble["children_left"],
+        ensemble["children_right"],
+        ensemble["leaf_values"],
+        ensemble["initial_scores"],
+        ensemble["scale"],
+    )
+    
+    # A single output column is the binary log-odds of the positive class
+    if scores.shape[1] == 1:
+        class_indices = (scores[:, 0] > 0).astype(np.int64)
+    else:
+        class_indices = np.argmax(scores, axis=1)
+    
+    return ensemble["classes"][class_indices]
+
+
+def make_predictions(model, features: np.ndarray) -> np.ndarray:
     """
     Make predictions using the loaded model.
     
+    Decision trees and gradient boosting models are evaluated with the
+    compiled tree-ensemble kernel; other models use their own predict.
+    
     Args:
         model: Trained model
         features: Preprocessed features for prediction
@@ -100,9 +332,12 @@ def make_predictions(model, features: pd.DataFrame) -> np.ndarray:
     Returns:
         Array of predictions
     """
-    print("Making predictions...")
-    predictions = model.predict(features)
-    print("[OK] Predictions completed")
+    logger.info("Making predictions...")
+    if isinstance(model, (DecisionTreeClassifier, GradientBoostingClassifier)):
+        predictions = predict_tree_ensemble(build_tree_ensemble(model), features)
+    else:
+        predictions = model.predict(features)
+    logger.info("[OK] Predictions completed")
     return predictions
 
 
@@ -116,18 +351,22 @@ def interpret_predictions(predictions: np.ndarray) -> list[str]:
     Returns:
         List of interpreted labels
     """
-    # Fetal health classification mapping
-    health_mapping = {
-        1.0: "Normal",
-        2.0: "Suspect",
-        3.0: "Pathological"
-    }
+    predictions = np.asarray(predictions)
     
-    return [health_mapping.get(pred, "Unknown") for pred in predictions]
+    # Gather labels by code without branching, then blank out unknown codes
+    label_indices = np.clip(
+        predictions.astype(np.int64) - 1,
+        0,
+        len(HEALTH_LABELS) - 1
+    )
+    labels = np.take(HEALTH_LABELS, label_indices)
+    known = np.isin(predictions, HEALTH_CODES)
+    
+    return np.where(known, labels, "Unknown").tolist()
 
 
 def display_predictions(
-    features: pd.DataFrame,
+    sample_index: np.ndarray,
     predictions: np.ndarray,
     labels: list[str]
 ) -> None:
@@ -135,7 +374,7 @@ def display_predictions(
     Display predictions in a formatted table.
     
     Args:
-        features: Original features DataFrame
+        sample_index: Original row index of each sample
         predictions: Numerical predictions
         labels: Interpreted prediction labels
     """
@@ -144,7 +383,7 @@ def display_predictions(
     print("="*80)
     
     results_df = pd.DataFrame({
-        'Sample_Index': features.index,
+        'Sample_Index': sample_index,
         'Prediction_Code': predictions,
         'Fetal_Health_Status': labels
     })
@@ -152,16 +391,19 @@ def display_predictions(
     print(results_df.to_string(index=False))
     print("="*80)
     
-    # Summary statistics
+    # Summary statistics, counted in a single pass
     print("\nSummary:")
-    for label in set(labels):
-        count = labels.count(label)
+    unique_labels, counts = np.unique(np.asarray(labels), return_counts=True)
+    for label, count in zip(unique_labels, counts):
         percentage = (count / len(labels)) * 100
         print(f"  {label}: {count} samples ({percentage:.1f}%)")
 
 
 def main():
     """Main function to execute the prediction pipeline."""
+    # Show the pipeline's progress messages on the console
+    logging.basicConfig(level=logging.INFO, format="%(message)s", stream=sys.stdout)
+    
     print("="*80)
     print("FETAL HEALTH PREDICTION SYSTEM")
     print("="*80)
@@ -179,8 +421,9 @@ def main():
     
     print()
     
-    # Load the trained model
+    # Load the trained model and the scaler fitted during training
     model = load_model(model_path)
+    scaler = load_model(SCALER_PATH)
     print()
     
     # Load sample data
@@ -188,7 +431,7 @@ def main():
     print()
     
     # Preprocess features
-    preprocessed_features = preprocess_features(sample_features)
+    preprocessed_features = preprocess_features(sample_features, scaler)
     print()
     
     # Make predictions
@@ -199,7 +442,11 @@ def main():
     prediction_labels = interpret_predictions(predictions)
     
     # Display results
-    display_predictions(sample_features, predictions, prediction_labels)
+    display_predictions(
+        sample_features.index.to_numpy(),
+        predictions,
+        prediction_labels
+    )
     
     print("\n[OK] Prediction pipeline completed successfully!")
 
@@ -4,6 +4,8 @@ Unit tests for the FastAPI application endpoints.
 Tests API endpoints, request/response handling, and error cases.
 """
 
+import threading
+
 import pytest
 from fastapi.testclient import TestClient
 from unittest.mock import Mock, patch
@@ -12,6 +14,7 @@ import sys
 import os
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'api'))
 
+import main
 from main import app
 from schemas import PredictionResponse
 
@@ -150,6 +153,29 @@ class TestPredictEndpoint:
         response = client.post("/predict", json=payload)
         assert response.status_code == 422  # Validation error
     
+    def test_predict_null_model_name(self, client, mock_model_manager):
+        """Test that a null model name selects the default model."""
+        mock_model_manager.predict.return_value = PredictionResponse(
+            prediction_code=1.0,
+            health_status="Normal",
+            model_used="gradient_boosting",
+            confidence=0.95
+        )
+        
+        payload = {
+            "features": {
+                "severe_decelerations": 0.0,
+                "accelerations": 0.0,
+                "fetal_movement": 0.0,
+                "uterine_contractions": 0.0
+            },
+            "model_name": None
+        }
+        
+        response = client.post("/predict", json=payload)
+        assert response.status_code == 200
+        assert mock_model_manager.predict.call_args.kwargs["model_name"] == "gradient_boosting"
+    
     def test_predict_model_error(self, client, mock_model_manager):
         """Test prediction when model raises error."""
         mock_model_manager.predict.side_effect = ValueError("Model not found")
@@ -223,9 +249,12 @@ class TestBatchPredictEndpoint:
         
         response = client.post("/predict/batch", json=payload)
         assert response.status_code == 200
+        assert response.headers["content-type"] == "application/json"
         data = response.json()
         assert "predictions" in data
         assert len(data["predictions"]) == 2
+        assert data["predictions"][1]["health_status"] == "Suspect"
+        assert data["predictions"][1]["confidence"] == 0.87
     
     def test_batch_predict_empty_list(self, client, mock_model_manager):
         """Test batch prediction with empty features list."""
@@ -237,6 +266,15 @@ class TestBatchPredictEndpoint:
         response = client.post("/predict/batch", json=payload)
         assert response.status_code == 422  # Validation error
     
+    def test_batch_predict_invalid_json(self, client, mock_model_manager):
+        """Test batch prediction with a malformed JSON body."""
+        response = client.post(
+            "/predict/batch",
+            content="invalid json",
+            headers={"Content-Type": "application/json"}
+        )
+        assert response.status_code == 422
+    
     def test_batch_predict_error(self, client, mock_model_manager):
         """Test batch prediction when error occurs."""
         mock_model_manager.predict_batch.side_effect = Exception("Prediction failed")
@@ -256,6 +294,45 @@ class TestBatchPredictEndpoint:
         assert response.status_code == 500
 
 
+class TestInferenceExecutor:
+    """Tests for running inference on the inference thread pool."""
+    
+    def test_executor_lifecycle(self):
+        """Test that the lifespan starts and stops the inference pool."""
+        with TestClient(app):
+            assert main.inference_executor is not None
+        assert main.inference_executor is None
+    
+    def test_predict_runs_on_inference_pool(self, mock_model_manager):
+        """Test that predictions run off the event loop thread."""
+        threads = []
+        
+        def predict(**kwargs):
+            threads.append(threading.current_thread().name)
+            return PredictionResponse(
+                prediction_code=1.0,
+                health_status="Normal",
+                model_used="gradient_boosting"
+            )
+        
+        mock_model_manager.predict.side_effect = predict
+        payload = {
+            "features": {
+                "severe_decelerations": 0.0,
+                "accelerations": 0.0,
+                "fetal_movement": 0.0,
+                "uterine_contractions": 0.0
+            }
+        }
+        
+        with TestClient(app) as client:
+            with patch('main.model_manager', mock_model_manager):
+                response = client.post("/predict", json=payload)
+        
+        assert response.status_code == 200
+        assert threads[0].startswith("inference")
+
+
 class TestCORS:
     """Tests for CORS middleware."""
     
@@ -278,6 +355,30 @@ class TestValidation:
         )
         assert response.status_code == 422
     
+    def test_validation_error_location(self, client, mock_model_manager):
+        """Test that validation errors point into the request body."""
+        payload = {
+            "features": {
+                "severe_decelerations": 0.0,
+                "accelerations": 0.0,
+                "fetal_movement": 0.0,
+                "uterine_contractions": 0.0
+            },
+            "model_name": "invalid_model"
+        }
+        
+        response = client.post("/predict", json=payload)
+        assert response.status_code == 422
+        assert response.json()["detail"][0]["loc"] == ["body", "model_name"]
+    
+    def test_predict_request_body_documented(self, client):
+        """Test that the raw-body prediction endpoint keeps its OpenAPI schema."""
+        schema = client.get("/openapi.json").json()
+        body = schema["paths"]["/predict"]["post"]["requestBody"]
+        properties = body["content"]["application/json"]["schema"]["properties"]
+        assert "features" in properties
+        assert "model_name" in properties
+    
     def test_extra_fields_ignored(self, client, mock_model_manager):
         """Test that extra fields in request are handled properly."""
         mock_model_manager.predict.return_value = PredictionResponse(
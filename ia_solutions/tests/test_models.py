@@ -6,9 +6,9 @@ Tests model loading, preprocessing, and prediction functionality.
 
 import pytest
 import os
-import pickle
 import numpy as np
 from unittest.mock import Mock, patch, MagicMock
+from sklearn.preprocessing import StandardScaler
 
 import sys
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'api'))
@@ -22,14 +22,16 @@ class TestModelManager:
     
     @pytest.fixture
     def model_manager(self):
-        """Create a ModelManager instance for testing."""
-        return ModelManager()
+        """Create a ModelManager instance with an identity training scaler."""
+        manager = ModelManager()
+        manager.scaler = StandardScaler().fit(np.zeros((2, 4)))
+        return manager
     
-    def test_initialization(self, model_manager):
+    def test_initialization(self):
         """Test ModelManager initialization."""
+        model_manager = ModelManager()
         assert model_manager.models == {}
-        assert model_manager.scaler is not None
-        assert model_manager._scaler_fitted is False
+        assert model_manager.scaler is None
     
     def test_health_mapping(self, model_manager):
         """Test health status mapping."""
@@ -68,6 +70,20 @@ class TestModelManager:
         assert info[0]["name"] == "gradient_boosting"
         assert info[0]["type"] == "GradientBoostingClassifier"
         assert info[0]["loaded"] is True
+        assert info[0]["runtime"] == "scikit-learn"
+    
+    def test_get_models_info_onnx(self, model_manager):
+        """Test that models served through ONNX Runtime are reported."""
+        model_manager.models = {
+            "gradient_boosting": {
+                "model": Mock(),
+                "path": "test/path.pkl",
+                "type": "GradientBoostingClassifier",
+                "session": Mock()
+            }
+        }
+        info = model_manager.get_models_info()
+        assert info[0]["runtime"] == "onnxruntime"
     
     def test_interpret_prediction(self, model_manager):
         """Test prediction interpretation."""
@@ -76,14 +92,32 @@ class TestModelManager:
         assert model_manager._interpret_prediction(3.0) == "Pathological"
         assert model_manager._interpret_prediction(99.0) == "Unknown"
     
+    def test_interpret_predictions(self, model_manager):
+        """Test batch prediction interpretation."""
+        predictions = np.array([1.0, 2.0, 3.0, 99.0, 2.0, 2.5, 0.0, -1.0])
+        assert model_manager._interpret_predictions(predictions) == [
+            "Normal", "Suspect", "Pathological", "Unknown", "Suspect",
+            "Unknown", "Unknown", "Unknown"
+        ]
+    
     def test_preprocess_features(self, model_manager):
-        """Test feature preprocessing."""
-        features = [0.0, 0.0, 0.0, 0.0]
+        """Test that features are scaled with the training scaler."""
+        model_manager.scaler = StandardScaler().fit(
+            np.array([[0.0, 0.0, 0.0, 0.0], [2.0, 4.0, 6.0, 8.0]])
+        )
+        features = [1.0, 2.0, 3.0, 4.0]
         preprocessed = model_manager._preprocess_features(features)
         
         assert isinstance(preprocessed, np.ndarray)
         assert preprocessed.shape == (1, 4)
-        assert model_manager._scaler_fitted is True
+        # The training mean maps to zero
+        np.testing.assert_allclose(preprocessed, 0.0)
+    
+    def test_preprocess_features_without_scaler(self):
+        """Test that preprocessing is refused when no scaler was loaded."""
+        model_manager = ModelManager()
+        with pytest.raises(RuntimeError, match="Scaler not loaded"):
+            model_manager._preprocess_features([0.0, 0.0, 0.0, 0.0])
     
     def test_preprocess_features_shape(self, model_manager):
         """Test that preprocessing maintains correct shape."""
@@ -167,8 +201,11 @@ class TestModelManager:
         """Test batch predictions."""
         # Mock model
         mock_model = Mock()
-        mock_model.predict.return_value = np.array([1.0])
-        mock_model.predict_proba.return_value = np.array([[0.9, 0.05, 0.05]])
+        mock_model.predict.return_value = np.array([1.0, 2.0])
+        mock_model.predict_proba.return_value = np.array([
+            [0.9, 0.05, 0.05],
+            [0.2, 0.7, 0.1]
+        ])
         
         model_manager.models = {
             "test_model": {
@@ -197,25 +234,102 @@ class TestModelManager:
         
         assert len(results) == 2
         assert all(isinstance(r, PredictionResponse) for r in results)
+        assert [r.health_status for r in results] == ["Normal", "Suspect"]
+        assert [r.confidence for r in results] == [0.9, 0.7]
+        
+        # The whole batch is predicted with a single model call
+        mock_model.predict.assert_called_once()
+        batch_input = mock_model.predict.call_args[0][0]
+        assert batch_input.shape == (2, 4)
+    
+    def test_predict_with_onnx_session(self, model_manager):
+        """Test that predictions run through the ONNX session when loaded."""
+        mock_model = Mock()
+        mock_session = Mock()
+        mock_session.get_inputs.return_value = [Mock()]
+        mock_session.run.return_value = [
+            np.array([3], dtype=np.int64),
+            np.array([[0.1, 0.1, 0.8]], dtype=np.float32)
+        ]
+        
+        model_manager.models = {
+            "test_model": {
+                "model": mock_model,
+                "path": "test.pkl",
+                "type": "TestClassifier",
+                "session": mock_session
+            }
+        }
+        
+        features = FetalHealthFeatures(
+            severe_decelerations=0.0,
+            accelerations=0.0,
+            fetal_movement=0.0,
+            uterine_contractions=0.0
+        )
+        
+        result = model_manager.predict(features, model_name="test_model")
+        
+        assert result.prediction_code == 3.0
+        assert result.health_status == "Pathological"
+        assert result.confidence == pytest.approx(0.8)
+        mock_model.predict.assert_not_called()
+        
+        session_input = next(iter(mock_session.run.call_args[0][1].values()))
+        assert session_input.dtype == np.float32
+    
+    def test_predict_batch_model_not_found(self, model_manager):
+        """Test batch prediction with non-existent model."""
+        features_list = [
+            FetalHealthFeatures(
+                severe_decelerations=0.0,
+                accelerations=0.0,
+                fetal_movement=0.0,
+                uterine_contractions=0.0
+            )
+        ]
+        
+        with pytest.raises(ValueError, match="Model .* not found"):
+            model_manager.predict_batch(features_list, model_name="non_existent")
     
     @patch('os.path.exists')
-    @patch('builtins.open', create=True)
-    @patch('pickle.load')
-    def test_load_models_success(self, mock_pickle_load, mock_open, mock_exists, model_manager):
+    @patch('models.joblib.load')
+    def test_load_models_success(self, mock_joblib_load, mock_exists, model_manager):
         """Test successful model loading."""
-        # Mock file existence
-        mock_exists.return_value = True
+        # Mock file existence (pickles only, no ONNX exports)
+        mock_exists.side_effect = lambda path: path.endswith(".pkl")
         
-        # Mock pickle load
+        # Mock joblib load
         mock_model = Mock()
         mock_model.__class__.__name__ = "GradientBoostingClassifier"
-        mock_pickle_load.return_value = mock_model
+        mock_joblib_load.return_value = mock_model
         
         # Load models
         model_manager.load_models()
         
-        # Verify models were loaded
+        # Verify models and the training scaler were loaded
         assert len(model_manager.models) > 0
+        assert model_manager.scaler is mock_model
+    
+    @patch('os.path.exists')
+    @patch('models.joblib.load')
+    def test_load_models_missing_scaler(self, mock_joblib_load, mock_exists, model_manager):
+        """Test that models are not served without the training scaler."""
+        mock_exists.side_effect = lambda path: path.endswith("_model.pkl")
+        mock_joblib_load.return_value = Mock()
+        
+        with pytest.raises(FileNotFoundError, match="Scaler file not found"):
+            model_manager.load_models()
+    
+    @patch('os.path.exists', return_value=True)
+    @patch('models.ort')
+    def test_load_onnx_session_single_threaded(self, mock_ort, mock_exists, model_manager):
+        """Test that ONNX sessions leave parallelism to the request pool."""
+        session = model_manager._load_onnx_session("test_model.pkl")
+        
+        assert session is mock_ort.InferenceSession.return_value
+        session_options = mock_ort.InferenceSession.call_args.kwargs["sess_options"]
+        assert session_options.intra_op_num_threads == 1
     
     @patch('os.path.exists')
     def test_load_models_file_not_found(self, mock_exists, model_manager, capsys):
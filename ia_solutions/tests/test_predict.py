@@ -0,0 +1,285 @@
+"""
+Unit tests for the prediction pipeline.
+
+Tests prediction interpretation and the compiled tree-ensemble kernel.
+"""
+
+import pytest
+import numpy as np
+import pandas as pd
+from unittest.mock import Mock
+from sklearn.ensemble import GradientBoostingClassifier
+from sklearn.linear_model import LogisticRegression
+from sklearn.preprocessing import StandardScaler
+from sklearn.tree import DecisionTreeClassifier
+
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'predict'))
+
+from predict import (
+    _tree_ensemble_scores,
+    build_tree_ensemble,
+    display_predictions,
+    interpret_predictions,
+    load_sample_data,
+    make_predictions,
+    predict_tree_ensemble,
+    preprocess_features,
+    quantize_features,
+)
+
+
+@pytest.fixture
+def training_data():
+    """Create a small fetal health-like training set."""
+    rng = np.random.default_rng(42)
+    features = pd.DataFrame(
+        rng.normal(size=(200, 4)),
+        columns=[
+            'severe_decelerations',
+            'accelerations',
+            'fetal_movement',
+            'uterine_contractions'
+        ]
+    )
+    target = pd.Series(
+        np.where(features['accelerations'] > 0.5, 2.0, 1.0)
+    )
+    target[features['uterine_contractions'] > 1.0] = 3.0
+    return features, target
+
+
+class TestLoadSampleData:
+    """Tests for sample data loading."""
+    
+    def test_load_sample_data(self, tmp_path):
+        """Test loading a sample of feature rows from a CSV file."""
+        csv_path = tmp_path / "fetal_health.csv"
+        rows = [f"{i},{i * 0.1},{i * 0.2},{i * 0.3},{1 + i % 3}" for i in range(20)]
+        csv_path.write_text(
+            '"severe_decelerations","accelerations","fetal_movement",'
+            '"uterine_contractions","fetal_health"\n' + "\n".join(rows) + "\n"
+        )
+        
+        sample_data = load_sample_data(str(csv_path), n_samples=5)
+        
+        assert isinstance(sample_data, pd.DataFrame)
+        assert sample_data.shape == (5, 4)
+        assert list(sample_data.columns) == [
+            'severe_decelerations',
+            'accelerations',
+            'fetal_movement',
+            'uterine_contractions'
+        ]
+        assert sample_data.index.is_unique
+        # Each row keeps its original row number as index
+        for row, values in sample_data.iterrows():
+            assert values['severe_decelerations'] == row
+
+
+class TestPreprocessFeatures:
+    """Tests for feature preprocessing."""
+    
+    def test_preprocess_features(self, training_data, capsys):
+        """Test that the training scaler is applied and an array returned."""
+        features, _ = training_data
+        scaler = StandardScaler().fit(features.to_numpy())
+        
+        preprocessed = preprocess_features(features.head(5), scaler)
+        
+        # Progress messages go to the logger, not stdout
+        assert capsys.readouterr().out == ""
+        
+        assert isinstance(preprocessed, np.ndarray)
+        np.testing.assert_allclose(
+            preprocessed,
+            scaler.transform(features.head(5).to_numpy())
+        )
+
+
+class TestDisplayPredictions:
+    """Tests for prediction display."""
+    
+    def test_display_predictions(self, capsys):
+        """Test the results table and summary output."""
+        display_predictions(
+            np.array([7, 3, 11]),
+            np.array([1.0, 2.0, 1.0]),
+            ["Normal", "Suspect", "Normal"]
+        )
+        
+        output = capsys.readouterr().out
+        assert "PREDICTION RESULTS" in output
+        assert "11" in output
+        assert "Normal: 2 samples (66.7%)" in output
+        assert "Suspect: 1 samples (33.3%)" in output
+
+
+class TestInterpretPredictions:
+    """Tests for prediction interpretation."""
+    
+    def test_known_codes(self):
+        """Test mapping of known prediction codes."""
+        labels = interpret_predictions(np.array([1.0, 2.0, 3.0]))
+        assert labels == ["Normal", "Suspect", "Pathological"]
+    
+    def test_unknown_codes(self):
+        """Test that unexpected codes map to Unknown."""
+        labels = interpret_predictions(np.array([0.0, 2.5, 4.0, -1.0]))
+        assert labels == ["Unknown"] * 4
+
+
+class TestTreeEnsembleKernel:
+    """Tests for the compiled tree-ensemble kernel."""
+    
+    def test_decision_tree_matches_sklearn(self, training_data):
+        """Test kernel predictions for a decision tree."""
+        features, target = training_data
+        model = DecisionTreeClassifier(max_depth=6, random_state=42)
+        model.fit(features, target)
+        
+        predictions = predict_tree_ensemble(
+            build_tree_ensemble(model),
+            features.to_numpy()
+        )
+        
+        np.testing.assert_array_equal(predictions, model.predict(features))
+    
+    def test_gradient_boosting_matches_sklearn(self, training_data):
+        """Test kernel predictions for multiclass gradient boosting."""
+        features, target = training_data
+        model = GradientBoostingClassifier(
+            n_estimators=20,
+            max_depth=3,
+            random_state=42
+        )
+        model.fit(features, target)
+        
+        predictions = predict_tree_ensemble(
+            build_tree_ensemble(model),
+            features.to_numpy()
+        )
+        
+        np.testing.assert_array_equal(predictions, model.predict(features))
+    
+    def test_binary_gradient_boosting_matches_sklearn(self, training_data):
+        """Test kernel predictions for binary gradient boosting."""
+        features, target = training_data
+        binary_target = (target > 1.0).astype(float) + 1.0
+        model = GradientBoostingClassifier(
+            n_estimators=20,
+            max_depth=3,
+            random_state=42
+        )
+        model.fit(features, binary_target)
+        
+        predictions = predict_tree_ensemble(
+            build_tree_ensemble(model),
+            features.to_numpy()
+        )
+        
+        np.testing.assert_array_equal(predictions, model.predict(features))
+    
+    def test_quantized_compare_exact_at_thresholds(self, training_data):
+        """Test that values at and around split thresholds are routed exactly."""
+        features, target = training_data
+        model = DecisionTreeClassifier(max_depth=6, random_state=42)
+        model.fit(features, target)
+        
+        # Place every feature exactly on, just below and just above a threshold
+        thresholds = model.tree_.threshold[model.tree_.children_left >= 0]
+        base = np.repeat(thresholds.astype(np.float32)[:, np.newaxis], 4, axis=1)
+        boundary_features = np.vstack([
+            base,
+            np.nextafter(base, np.float32(-np.inf)),
+            np.nextafter(base, np.float32(np.inf)),
+        ])
+        
+        predictions = predict_tree_ensemble(
+            build_tree_ensemble(model),
+            boundary_features
+        )
+        
+        np.testing.assert_array_equal(
+            predictions,
+            model.predict(pd.DataFrame(boundary_features, columns=features.columns))
+        )
+    
+    def test_quantize_features(self, training_data):
+        """Test that feature codes count the thresholds below each value."""
+        features, target = training_data
+        model = DecisionTreeClassifier(max_depth=3, random_state=42)
+        model.fit(features, target)
+        ensemble = build_tree_ensemble(model)
+        
+        feature_codes = quantize_features(ensemble, features.to_numpy())
+        
+        assert feature_codes.dtype == np.uint16
+        for feature, bins in enumerate(ensemble["feature_bins"]):
+            values = features.iloc[:, feature].to_numpy(dtype=np.float32)
+            expected = (bins[np.newaxis, :] < values[:, np.newaxis]).sum(axis=1)
+            np.testing.assert_array_equal(feature_codes[:, feature], expected)
+    
+    def test_kernel_compiled_ahead_of_time(self, training_data):
+        """Test that predictions reuse the signature compiled at import."""
+        features, target = training_data
+        model = DecisionTreeClassifier(max_depth=3, random_state=42)
+        model.fit(features, target)
+        
+        predict_tree_ensemble(build_tree_ensemble(model), features.to_numpy())
+        
+        assert len(_tree_ensemble_scores.signatures) == 1
+    
+    def test_concurrent_callers(self, training_data):
+        """Test that the parallel kernel can be run from several threads."""
+        from concurrent.futures import ThreadPoolExecutor
+        import numba
+        
+        features, target = training_data
+        model = DecisionTreeClassifier(max_depth=4, random_state=42)
+        model.fit(features, target)
+        ensemble = build_tree_ensemble(model)
+        
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            results = list(executor.map(
+                lambda _: predict_tree_ensemble(ensemble, features.to_numpy()),
+                range(16)
+            ))
+        
+        assert numba.threading_layer() in ("tbb", "omp")
+        for predictions in results:
+            np.testing.assert_array_equal(predictions, model.predict(features))
+    
+    def test_unsupported_model(self, training_data):
+        """Test that unsupported models are rejected."""
+        features, target = training_data
+        model = LogisticRegression().fit(features, target)
+        
+        with pytest.raises(TypeError, match="Unsupported model type"):
+            build_tree_ensemble(model)
+
+
+class TestMakePredictions:
+    """Tests for the make_predictions dispatcher."""
+    
+    def test_tree_model_uses_kernel(self, training_data):
+        """Test that tree models are evaluated with the kernel."""
+        features, target = training_data
+        model = DecisionTreeClassifier(max_depth=4, random_state=42)
+        model.fit(features, target)
+        
+        predictions = make_predictions(model, features.to_numpy())
+        
+        np.testing.assert_array_equal(predictions, model.predict(features))
+    
+    def test_other_model_uses_predict(self):
+        """Test that other models fall back to their own predict."""
+        mock_model = Mock()
+        mock_model.predict.return_value = np.array([1.0, 2.0])
+        features = np.zeros((2, 4))
+        
+        predictions = make_predictions(mock_model, features)
+        
+        mock_model.predict.assert_called_once_with(features)
+        assert predictions.tolist() == [1.0, 2.0]
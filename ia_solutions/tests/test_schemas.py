@@ -4,6 +4,7 @@ Unit tests for the API schemas module.
 Tests Pydantic models for validation and serialization.
 """
 
+import numpy as np
 import pytest
 from pydantic import ValidationError
 
@@ -19,6 +20,7 @@ from schemas import (
     BatchPredictionResponse,
     HealthResponse,
     ModelInfoResponse,
+    features_to_ndarray,
 )
 
 
@@ -50,6 +52,33 @@ class TestFetalHealthFeatures:
         assert feature_list == [0.001, 0.002, 0.003, 0.004]
         assert len(feature_list) == 4
     
+    def test_to_ndarray_conversion(self):
+        """Test converting features to a (1, 4) float64 array."""
+        features = FetalHealthFeatures(
+            severe_decelerations=0.001,
+            accelerations=0.002,
+            fetal_movement=0.003,
+            uterine_contractions=0.004
+        )
+        array = features.to_ndarray()
+        assert array.shape == (1, 4)
+        assert array.dtype == np.float64
+        assert array[0].tolist() == features.to_list()
+    
+    def test_to_ndarray_into_buffer(self):
+        """Test writing features into a row of a preallocated matrix."""
+        features = FetalHealthFeatures(
+            severe_decelerations=0.001,
+            accelerations=0.002,
+            fetal_movement=0.003,
+            uterine_contractions=0.004
+        )
+        buffer = np.zeros((3, 4))
+        result = features.to_ndarray(buffer, row=1)
+        assert result is buffer
+        assert buffer[1].tolist() == [0.001, 0.002, 0.003, 0.004]
+        assert buffer[0].tolist() == [0.0, 0.0, 0.0, 0.0]
+    
     def test_missing_field(self):
         """Test that missing required fields raise validation error."""
         with pytest.raises(ValidationError):
@@ -100,6 +129,17 @@ class TestPredictionRequest:
         request = PredictionRequest(features=features)
         assert request.model_name == "gradient_boosting"
     
+    def test_null_model_name(self):
+        """Test that a null model_name falls back to gradient_boosting."""
+        features = FetalHealthFeatures(
+            severe_decelerations=0.0,
+            accelerations=0.0,
+            fetal_movement=0.0,
+            uterine_contractions=0.0
+        )
+        request = PredictionRequest(features=features, model_name=None)
+        assert request.model_name == "gradient_boosting"
+    
     def test_invalid_model_name(self):
         """Test that invalid model names raise validation error."""
         features = FetalHealthFeatures(
@@ -154,6 +194,15 @@ class TestPredictionResponse:
             model_used="decision_tree"
         )
         assert response.confidence is None
+    
+    def test_slotted_response(self):
+        """Test that responses are slotted and carry no instance dict."""
+        response = PredictionResponse(
+            prediction_code=1.0,
+            health_status="Normal",
+            model_used="gradient_boosting"
+        )
+        assert not hasattr(response, "__dict__")
 
 
 class TestBatchPredictionRequest:
@@ -182,6 +231,52 @@ class TestBatchPredictionRequest:
         assert len(request.features_list) == 2
         assert request.model_name == "gradient_boosting"
     
+    def test_features_to_ndarray(self):
+        """Test filling the batch feature matrix."""
+        request = BatchPredictionRequest.model_validate_json(
+            '{"features_list": ['
+            '{"severe_decelerations": 0.0, "accelerations": 0.0,'
+            ' "fetal_movement": 0.0, "uterine_contractions": 0.0},'
+            '{"severe_decelerations": 0.001, "accelerations": 0.002,'
+            ' "fetal_movement": 0.003, "uterine_contractions": 0.004}'
+            ']}'
+        )
+        matrix = features_to_ndarray(request.features_list)
+        assert matrix.shape == (2, 4)
+        assert matrix.dtype == np.float64
+        assert matrix[1].tolist() == [0.001, 0.002, 0.003, 0.004]
+    
+    def test_invalid_model_name(self):
+        """Test that invalid model names raise validation error."""
+        features = FetalHealthFeatures(
+            severe_decelerations=0.0,
+            accelerations=0.0,
+            fetal_movement=0.0,
+            uterine_contractions=0.0
+        )
+        with pytest.raises(ValidationError):
+            BatchPredictionRequest(
+                features_list=[features],
+                model_name="invalid_model"
+            )
+    
+    def test_null_model_name(self):
+        """Test that a null model_name in the JSON body selects the default."""
+        request = BatchPredictionRequest.model_validate_json(
+            '{"features_list": [{"severe_decelerations": 0.0,'
+            ' "accelerations": 0.0, "fetal_movement": 0.0,'
+            ' "uterine_contractions": 0.0}], "model_name": null}'
+        )
+        assert request.model_name == "gradient_boosting"
+    
+    def test_model_name_schema_enum(self):
+        """Test that valid model names are published as a schema enum."""
+        schema = BatchPredictionRequest.model_json_schema()
+        assert schema["properties"]["model_name"]["enum"] == [
+            "decision_tree",
+            "gradient_boosting"
+        ]
+    
     def test_empty_features_list(self):
         """Test that empty features list raises validation error."""
         with pytest.raises(ValidationError):
@@ -244,3 +339,4 @@ class TestModelInfoResponse:
         assert response.type == "GradientBoostingClassifier"
         assert response.loaded is True
         assert "gradient_boosting_model.pkl" in response.file_path
+        assert response.runtime == "scikit-learn"
@@ -7,7 +7,7 @@ Tests data loading, preprocessing, model training, and saving functionality.
 import pytest
 import pandas as pd
 import numpy as np
-from unittest.mock import Mock, patch, MagicMock, mock_open
+from unittest.mock import Mock, patch, MagicMock
 import os
 
 import sys
@@ -16,11 +16,13 @@ sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'train'))
 from train import (
     load_fetal_health_data,
     prepare_features_and_target,
+    fit_scaler,
     scale_features,
     split_train_test_data,
     train_decision_tree,
     train_gradient_boosting,
     evaluate_model,
+    export_onnx_model,
     save_model,
 )
 
@@ -124,6 +126,23 @@ class TestScaleFeatures:
         scaled = scale_features(features)
         
         assert list(scaled.columns) == ['col_a', 'col_b']
+    
+    def test_scale_features_with_fitted_scaler(self):
+        """Test that a provided scaler is applied instead of refitting."""
+        train_features = pd.DataFrame({
+            'feature1': [1.0, 2.0, 3.0],
+            'feature2': [10.0, 20.0, 30.0]
+        })
+        new_features = pd.DataFrame({
+            'feature1': [2.0],
+            'feature2': [20.0]
+        })
+        
+        scaler = fit_scaler(train_features)
+        scaled = scale_features(new_features, scaler)
+        
+        # The training mean maps to zero under the training scaler
+        assert np.allclose(scaled.to_numpy(), 0.0)
 
 
 class TestSplitTrainTestData:
@@ -264,9 +283,8 @@ class TestSaveModel:
     """Tests for model saving."""
     
     @patch('train.os.makedirs')
-    @patch('builtins.open', new_callable=mock_open)
-    @patch('train.pickle.dump')
-    def test_save_model(self, mock_pickle_dump, mock_file, mock_makedirs):
+    @patch('train.joblib.dump')
+    def test_save_model(self, mock_joblib_dump, mock_makedirs):
         """Test saving model to disk."""
         mock_model = Mock()
         
@@ -274,13 +292,11 @@ class TestSaveModel:
         
         assert "test_model.pkl" in result
         mock_makedirs.assert_called_once_with("test_dir", exist_ok=True)
-        mock_file.assert_called_once()
-        mock_pickle_dump.assert_called_once()
+        mock_joblib_dump.assert_called_once_with(mock_model, result)
     
     @patch('train.os.makedirs')
-    @patch('builtins.open', new_callable=mock_open)
-    @patch('train.pickle.dump')
-    def test_save_model_default_dir(self, mock_pickle_dump, mock_file, mock_makedirs):
+    @patch('train.joblib.dump')
+    def test_save_model_default_dir(self, mock_joblib_dump, mock_makedirs):
         """Test saving model with default directory."""
         mock_model = Mock()
         
@@ -291,6 +307,50 @@ class TestSaveModel:
         mock_makedirs.assert_called_once()
 
 
+class TestExportOnnxModel:
+    """Tests for ONNX model export."""
+    
+    def test_export_onnx_model(self, tmp_path):
+        """Test exporting a trained model to ONNX."""
+        import onnxruntime as ort
+        
+        features = pd.DataFrame({
+            'feature1': [0.0, 0.1, 0.9, 1.0] * 5,
+            'feature2': [1.0, 0.9, 0.1, 0.0] * 5
+        })
+        target = pd.Series([1.0, 1.0, 2.0, 2.0] * 5)
+        model = train_decision_tree(features, target, max_depth=2)
+        
+        result = export_onnx_model(model, "test_model", 2, str(tmp_path))
+        
+        assert result.endswith("test_model.onnx")
+        session = ort.InferenceSession(result, providers=["CPUExecutionProvider"])
+        labels, probabilities = session.run(
+            None,
+            {"X": features.to_numpy(dtype=np.float32)}
+        )
+        assert labels.tolist() == model.predict(features).tolist()
+        assert probabilities.shape == (20, 2)
+    
+    @patch.dict('sys.modules', {'skl2onnx': None})
+    def test_export_onnx_model_without_skl2onnx(self, tmp_path):
+        """Test that the export is skipped when skl2onnx is missing."""
+        result = export_onnx_model(Mock(), "test_model", 2, str(tmp_path))
+        
+        assert result is None
+    
+    @patch.dict('sys.modules', {'skl2onnx': None})
+    def test_export_onnx_model_removes_stale_export(self, tmp_path):
+        """Test that a skipped export removes the previous ONNX model."""
+        stale_path = tmp_path / "test_model.onnx"
+        stale_path.write_bytes(b"stale")
+        
+        result = export_onnx_model(Mock(), "test_model", 2, str(tmp_path))
+        
+        assert result is None
+        assert not stale_path.exists()
+
+
 class TestIntegration:
     """Integration tests for the training pipeline."""
     
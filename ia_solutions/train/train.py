@@ -7,8 +7,9 @@ Gradient Boosting.
 """
 
 import os
-import pickle
 
+import joblib
+import numpy as np
 import pandas as pd
 import matplotlib.pyplot as plt
 from sklearn.ensemble import GradientBoostingClassifier
@@ -81,18 +82,42 @@ def prepare_features_and_target(data: pd.DataFrame) -> tuple[pd.DataFrame, pd.Se
     return features, target_labels
 
 
-def scale_features(features: pd.DataFrame) -> pd.DataFrame:
+def fit_scaler(features: pd.DataFrame) -> StandardScaler:
+    """
+    Fit a StandardScaler on the training features.
+    
+    The fitted scaler is saved next to the models so that inference applies
+    the same standardization used during training. It is fitted on the raw
+    array so it can be applied to plain numpy inputs at inference time.
+    
+    Args:
+        features: DataFrame with unnormalized features
+        
+    Returns:
+        Fitted StandardScaler
+    """
+    scaler = StandardScaler()
+    scaler.fit(features.to_numpy(dtype=np.float64))
+    return scaler
+
+
+def scale_features(
+    features: pd.DataFrame,
+    scaler: StandardScaler | None = None
+) -> pd.DataFrame:
     """
     Normalize features using StandardScaler.
     
     Args:
         features: DataFrame with unnormalized features
+        scaler: Fitted scaler to apply; a new one is fitted when omitted
         
     Returns:
         DataFrame with normalized features
     """
-    scaler = StandardScaler()
-    scaled_features_array = scaler.fit_transform(features)
+    if scaler is None:
+        scaler = fit_scaler(features)
+    scaled_features_array = scaler.transform(features.to_numpy(dtype=np.float64))
     scaled_features = pd.DataFrame(
         scaled_features_array, 
         columns=list(features.columns)
@@ -186,7 +211,7 @@ def train_gradient_boosting(
 
 def save_model(model, model_name: str, output_dir: str = MODELS_DIR) -> str:
     """
-    Save a trained model to disk using pickle.
+    Save a trained model to disk using joblib.
     
     Args:
         model: Trained model to save
@@ -203,13 +228,61 @@ def save_model(model, model_name: str, output_dir: str = MODELS_DIR) -> str:
     model_path = os.path.join(output_dir, f"{model_name}.pkl")
     
     # Save the model
-    with open(model_path, 'wb') as file:
-        pickle.dump(model, file)
+    joblib.dump(model, model_path)
     
     print(f"✅ Model saved to: {model_path}")
     return model_path
 
 
+def export_onnx_model(
+    model,
+    model_name: str,
+    n_features: int,
+    output_dir: str = MODELS_DIR
+) -> str | None:
+    """
+    Export a trained model to ONNX for inference with ONNX Runtime.
+    
+    Any existing export is removed first, so a skipped or failed export
+    never leaves an ONNX model from a previous training run next to the
+    newly saved model. The export is skipped when skl2onnx is not installed.
+    
+    Args:
+        model: Trained model to export
+        model_name: Name for the model file (without extension)
+        n_features: Number of input features
+        output_dir: Directory to save the model
+        
+    Returns:
+        Path to the exported model file, or None if the export was skipped
+    """
+    model_path = os.path.join(output_dir, f"{model_name}.onnx")
+    if os.path.exists(model_path):
+        os.remove(model_path)
+    
+    try:
+        from skl2onnx import convert_sklearn
+        from skl2onnx.common.data_types import FloatTensorType
+    except ImportError:
+        print("⚠️  skl2onnx not installed, skipping ONNX export")
+        return None
+    
+    # Output plain probability arrays instead of per-sample dictionaries
+    onnx_model = convert_sklearn(
+        model,
+        initial_types=[("X", FloatTensorType([None, n_features]))],
+        options={id(model): {"zipmap": False}}
+    )
+    
+    os.makedirs(output_dir, exist_ok=True)
+    
+    with open(model_path, 'wb') as file:
+        file.write(onnx_model.SerializeToString())
+    
+    print(f"✅ ONNX model saved to: {model_path}")
+    return model_path
+
+
 def evaluate_model(
     model,
     features_test: pd.DataFrame,
@@ -243,7 +316,11 @@ def main():
     
     # Normalization
     print("Normalizing features...")
-    scaled_features = scale_features(features)
+    scaler = fit_scaler(features)
+    scaled_features = scale_features(features, scaler)
+    
+    # Save the scaler for inference
+    save_model(scaler, "scaler")
     
     # Train/test split
     print("Splitting data into train and test sets...")
@@ -264,6 +341,7 @@ def main():
     
     # Save Decision Tree model
     save_model(decision_tree_model, "decision_tree_model")
+    export_onnx_model(decision_tree_model, "decision_tree_model", features.shape[1])
     
     # Training and evaluation - Gradient Boosting
     print("\n=== Gradient Boosting Classifier ===")
@@ -277,6 +355,7 @@ def main():
     
     # Save Gradient Boosting model
     save_model(gradient_boosting_model, "gradient_boosting_model")
+    export_onnx_model(gradient_boosting_model, "gradient_boosting_model", features.shape[1])
     
     print("\n🎉 Training completed! Models saved successfully.")
 
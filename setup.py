@@ -16,7 +16,10 @@ setup(
         "scikit-learn",
         "matplotlib",
         "yfinance",
-        "joblib"
+        "joblib",
+        "numba",
+        "onnxruntime",
+        "skl2onnx"
     ],
     include_package_data=True,
     zip_safe=False,